@@ -1,12 +1,35 @@
+import logging
+import sys
+from enum import IntEnum
+
+logger = logging.getLogger(__name__)
+
+class CellType(IntEnum):
+    """One-byte codes for cell kinds, used by flat per-board arrays (see map_parser.load_map_codes)."""
+    EMPTY = 0 # Traversable path, including cells with unrecognized symbols
+    WALL = 1
+    KIOSK = 2
+    BASEMENT = 3
+    STUDENT = 4
+    COOK = 5
+    LIBRARIAN = 6
+
 class Cell:
     """Base class for all cell types on the game board."""
+    # Slots instead of a per-instance __dict__: the board holds one of these per grid square
+    __slots__ = ('row', 'col', 'symbol', '_repr')
+    cell_type = CellType.EMPTY
+
     def __init__(self, row: int, col: int, symbol: str):
         self.row = row
         self.col = col
-        self.symbol = symbol
+        self.symbol = sys.intern(symbol) # Identical symbols share one string object
+        self._repr = None
 
     def __repr__(self):
-        return f"{self.__class__.__name__}({self.row}, {self.col}, '{self.symbol}')"
+        if self._repr is None: # Cells never move, so the string is built once
+            self._repr = f"{self.__class__.__name__}({self.row}, {self.col}, '{self.symbol}')"
+        return self._repr
 
     def on_enter(self, player, game_state):
         """
@@ -17,81 +40,101 @@ class Cell:
 
 class Wall(Cell):
     """Represents an impassable wall cell."""
+    __slots__ = ()
+    cell_type = CellType.WALL
+
     def __init__(self, row: int, col: int):
         super().__init__(row, col, '.')
 
     def on_enter(self, player, game_state):
         # Players should not be able to enter a wall.
         # This logic might be better handled by movement validation.
-        print("Cannot enter a wall.")
+        logger.debug("Cannot enter a wall.")
         pass 
 
 class Kiosk(Cell):
     """Represents a Kiosk cell where players can draw a card."""
+    __slots__ = ()
+    cell_type = CellType.KIOSK
+
     def __init__(self, row: int, col: int):
         super().__init__(row, col, 'K')
 
     def on_enter(self, player, game_state):
         # Logic to draw a card will be handled by the Game class
         # This method can signify the type of interaction.
-        print(f"Player {player.id} entered Kiosk at ({self.row},{self.col}). Should draw a card.")
+        logger.debug("Player %s entered Kiosk at (%d,%d). Should draw a card.", player.id, self.row, self.col)
         # game_state.player_draws_card(player)
         pass
 
 class Basement(Cell):
     """Represents a Basement cell where players can get food."""
+    __slots__ = ()
+    cell_type = CellType.BASEMENT
+
     def __init__(self, row: int, col: int):
         super().__init__(row, col, 'B')
 
     def on_enter(self, player, game_state):
         # Logic to gain food will be handled by the Game class
-        print(f"Player {player.id} entered Basement at ({self.row},{self.col}). Should gain 2 food.")
+        logger.debug("Player %s entered Basement at (%d,%d). Should gain 2 food.", player.id, self.row, self.col)
         # player.gain_food(2)
         pass
 
 class OwnerCell(Cell):
     """Base class for cells occupied by an owner."""
+    __slots__ = ('owner_name',)
+
     def __init__(self, row: int, col: int, symbol: str, owner_name: str):
         super().__init__(row, col, symbol)
         self.owner_name = owner_name
 
     def on_enter(self, player, game_state):
         # Common logic for entering any owner cell, if any, or specific in subclass
-        print(f"Player {player.id} entered {self.owner_name}'s cell at ({self.row},{self.col}).")
+        logger.debug("Player %s entered %s's cell at (%d,%d).", player.id, self.owner_name, self.row, self.col)
         pass
 
 class StudentCell(OwnerCell):
     """Represents the Student's cell."""
+    __slots__ = ()
+    cell_type = CellType.STUDENT
+
     def __init__(self, row: int, col: int):
         super().__init__(row, col, 'S', 'Student')
 
     def on_enter(self, player, game_state):
         super().on_enter(player, game_state) # Call base if it has common logic
         # Logic to gain trust with Student
-        print(f"Should gain 1 trust with Student.")
+        logger.debug("Should gain 1 trust with Student.")
         # player.gain_trust(self.owner_name, 1)
         pass
 
 class CookCell(OwnerCell):
     """Represents the Cook's cell."""
+    __slots__ = ()
+    cell_type = CellType.COOK
+
     def __init__(self, row: int, col: int):
         super().__init__(row, col, 'C', 'Cook')
 
     def on_enter(self, player, game_state):
         super().on_enter(player, game_state)
         # Logic to gain 2 food (as per game_rules.md for visiting Cook directly)
-        print(f"Should gain 2 food.")
+        logger.debug("Should gain 2 food.")
         # player.gain_food(2)
         pass
 
 class LibrarianCell(OwnerCell):
     """Represents the Librarian's cell."""
+    __slots__ = ()
+    cell_type = CellType.LIBRARIAN
+
     def __init__(self, row: int, col: int):
         super().__init__(row, col, 'L', 'Librarian')
 
     def on_enter(self, player, game_state):
         super().on_enter(player, game_state)
         # Logic to draw a card (as per game_rules.md for visiting Librarian directly)
-        print(f"Should draw 1 card.")
+        logger.debug("Should draw 1 card.")
         # game_state.player_draws_card(player)
         pass 
\ No newline at end of file
@@ -1,11 +1,18 @@
 # This file will define the Card class and functions for managing the card deck. 
 
+import hashlib
+import itertools
 import json
+import logging
+import os
 import random
-from typing import List, Dict, Any, TYPE_CHECKING, Optional
+import sys
+from typing import List, Dict, Any, TYPE_CHECKING, Optional, Tuple
+
+import json_backend
 
 # Import Effect and its related components for Deck operation
-from effects import EFFECT_REGISTRY, Effect, ConditionalEffect
+from effects import EFFECT_REGISTRY, Effect, ConditionalEffect, ArmDelayedEffect
 
 # Conditional import for type hinting to avoid circular dependency
 if TYPE_CHECKING:
@@ -13,8 +20,35 @@ if TYPE_CHECKING:
     from player import Player
     from game import Game
 
-class Card:
-    """Represents a single playing card in the Alley Cats game."""
+logger = logging.getLogger(__name__)
+
+# Card types already parsed in this process, keyed by (absolute JSON path, SHA-256 of its content).
+# Filled by the first Deck; later decks, including those in worker processes forked after it, reuse it.
+_parsed_card_types: Dict[Tuple[str, str], List[Tuple['CardPrototype', int]]] = {}
+
+# Monotonic source for integer card IDs; cheaper than drawing from the RNG for every card
+_card_id_counter = itertools.count()
+
+def _fisher_yates(items: list, start: int = 0, stop: int | None = None) -> None:
+    """Shuffles items[start:stop] in place.
+       Bounded indices use Lemire's multiply-shift ((r * n) >> 64) instead of
+       random.shuffle's per-swap _randbelow call with its rejection loop.
+    """
+    if stop is None:
+        stop = len(items)
+    getrandbits = random.getrandbits
+    for i in range(stop - 1, start, -1):
+        j = start + ((getrandbits(64) * (i - start + 1)) >> 64)
+        items[i], items[j] = items[j], items[i]
+
+class CardPrototype:
+    """Data shared by every copy of one card type. Cards of the same type point to a single
+       prototype (flyweight) instead of each holding their own references.
+    """
+    __slots__ = ('title', 'description', 'discard_condition', 'effects', 'cost', 'timing',
+                 'target_needed', 'card_type_flags', 'attributes_granted',
+                 'move_bonus', 'fight_bonus', 'wall_pass')
+
     def __init__(self, 
                  title: str, 
                  description: str, 
@@ -23,43 +57,63 @@ class Card:
                  cost: Dict[str, Any], 
                  timing: str, 
                  target_needed: bool, 
-                 card_type_flags: Optional[List[str]] = None, 
-                 attributes_granted: Optional[Dict[str, Any]] = None,
-                 card_id: Optional[str] = None):
-        self.title: str = title
+                 card_type_flags: List[str], 
+                 attributes_granted: Dict[str, Any]):
+        # Values are expected to be normalized already (see Deck._build_card_types): no None placeholders
+        self.title: str = sys.intern(title) # Titles are compared a lot; interned ones usually match by identity
         self.description: str = description
         self.discard_condition: str = discard_condition
-        self.id: str = card_id if card_id else f"{title.replace(' ', '_')}_{random.randint(10000,99999)}"
         
         self.effects: List[Effect] = effects 
-        self.cost: Dict[str, Any] = cost if cost is not None else {}
-        self.timing: str = timing if timing is not None else "InTurn"
-        self.target_needed: bool = target_needed if target_needed is not None else False
-        self.card_type_flags: List[str] = card_type_flags if card_type_flags is not None else []
-        self.attributes_granted: Dict[str, Any] = attributes_granted if attributes_granted is not None else {}
+        self.cost: Dict[str, Any] = cost
+        self.timing: str = timing
+        self.target_needed: bool = target_needed
+        self.card_type_flags: List[str] = card_type_flags
+        self.attributes_granted: Dict[str, Any] = attributes_granted
+        # The bonuses Player sums up (see Player._recompute_bonuses), read out of attributes_granted once
+        self.move_bonus: int = int(attributes_granted.get("MovementBonus") or 0)
+        self.fight_bonus: int = int(attributes_granted.get("FightBonus") or 0)
+        self.wall_pass: bool = attributes_granted.get("WallPass") == True
 
     def __repr__(self) -> str:
-        return f"Card(title='{self.title}', id='{self.id}', effects_count={len(self.effects)})"
+        return f"CardPrototype(title='{self.title}', effects_count={len(self.effects)})"
+
+class Card:
+    """Represents a single playing card in the Alley Cats game.
+       A card only owns its unique ID; title, effects, cost etc. are read from its CardPrototype.
+    """
+    __slots__ = ('proto', 'id')
+
+    def __init__(self, proto: CardPrototype, card_id: Optional[int] = None):
+        self.proto: CardPrototype = proto
+        self.id: int = card_id if card_id is not None else next(_card_id_counter)
+
+    def __getattr__(self, name: str) -> Any:
+        """Called only for names not found on the card itself: delegates type-level fields to the prototype."""
+        if name == 'proto': # Slot not set yet (e.g. while unpickling); avoid infinite recursion
+            raise AttributeError(name)
+        return getattr(self.proto, name)
+
+    def __repr__(self) -> str:
+        return f"Card(title='{self.title}', id={self.id}, effects_count={len(self.effects)})"
 
     def __eq__(self, other) -> bool:
         """Two cards are considered equal if their unique IDs are the same.
            If you need to check for card *type* equality (e.g. two "Поймал мышку" cards are of the same type),
            compare their titles: card1.title == card2.title.
         """
-        if isinstance(other, Card):
-            return self.id == other.id
-        return False
+        return isinstance(other, Card) and self.id == other.id
 
     def __hash__(self) -> int:
         """Allows Card objects to be added to sets or used as dict keys based on their unique ID."""
-        return hash(self.id)
+        return self.id # Integer IDs are their own hash
 
     def can_play(self, player: 'Player', game_state: 'Game') -> bool:
         """Checks if the player can currently afford to play this card based on its cost."""
         for resource, amount in self.cost.items():
             if resource == "food":
                 if player.food < amount:
-                    print(f"{player.id} cannot afford {amount} food for {self.title} (has {player.food}).")
+                    logger.info("%s cannot afford %s food for %s (has %s).", player.id, amount, self.title, player.food)
                     return False
             # Add other resource checks (e.g., cards_to_discard) if needed
         return True
@@ -69,14 +123,14 @@ class Card:
         Activates all effects of this card.
         Assumes cost has already been paid and timing/targeting is validated by the Game class.
         """
-        print(f"{executing_player.id} is activating card: {self.title}")
+        logger.info("%s is activating card: %s", executing_player.id, self.title)
         all_effects_succeeded = True # Or track if any effect made a change
         for effect in self.effects:
             success = effect.execute(self, executing_player, game_state, targets)
             if not success:
                 # Decide on behavior: should one failed effect stop others?
                 # For now, let's say some effects might be optional or fail gracefully.
-                print(f"An effect of {self.title} did not fully succeed or apply.")
+                logger.info("An effect of %s did not fully succeed or apply.", self.title)
                 # all_effects_succeeded = False # Uncomment if one failure means overall failure
         
         # The Game class will handle discarding based on self.discard_condition
@@ -84,9 +138,16 @@ class Card:
 
 class Deck:
     """Manages the deck of cards, including draw and discard piles."""
+    __slots__ = ('_cards', '_head', '_draw_end', '_effect_cache')
+
     def __init__(self, card_data_filepath: str = "cards.json"):
-        self.draw_pile: list[Card] = []
-        self.discard_pile: list[Card] = []
+        # Both piles live in one list: _cards[_head:_draw_end] is the draw pile (top at _head),
+        # _cards[_draw_end:] is the discard pile. Slots before _head hold cards already drawn.
+        self._cards: list[Card] = []
+        self._head: int = 0
+        self._draw_end: int = 0
+        # Effects are treated as immutable, so identical specs share one instance: (type, canonical params JSON) -> Effect
+        self._effect_cache: Dict[Tuple[str, str], Effect] = {}
         # self._effect_factory = EffectFactory(EFFECT_REGISTRY) # Removed earlier, which was correct
         self._load_cards(card_data_filepath)
         self.shuffle()
@@ -95,9 +156,14 @@ class Deck:
         effect_type_str = effect_data.get("type")
         effect_params = effect_data.get("params", {})
         
+        cache_key = (effect_type_str, json.dumps(effect_params, sort_keys=True))
+        cached_effect = self._effect_cache.get(cache_key)
+        if cached_effect is not None:
+            return cached_effect
+
         effect_class = EFFECT_REGISTRY.get(effect_type_str)
         if not effect_class:
-            print(f"Warning: Unknown effect type '{effect_type_str}' in card data. Skipping this effect.")
+            logger.warning("Unknown effect type '%s' in card data. Skipping this effect.", effect_type_str)
             return None
         
         try:
@@ -115,36 +181,70 @@ class Deck:
                     sub_effect for sub_effect_data in else_effects_data
                     if (sub_effect := self._create_effect_instance(sub_effect_data)) is not None
                 ]
+            elif isinstance(effect_instance, ArmDelayedEffect):
+                # Triggered effects are built once here and shared. Their specs are kept alongside, so the game can
+                # build an effect whose owner comes from context with that owner when it fires (see Game._trigger_armed_effects).
+                triggered = [
+                    (sub_effect_data, sub_effect) for sub_effect_data in effect_instance.params.get("triggered_effects", [])
+                    if (sub_effect := self._create_effect_instance(sub_effect_data)) is not None
+                ]
+                effect_instance.triggered_effects_instances = [sub_effect for _, sub_effect in triggered]
+                effect_instance.triggered_effects_data = [sub_effect_data for sub_effect_data, _ in triggered]
+            self._effect_cache[cache_key] = effect_instance
             return effect_instance
-        except Exception as e:
-            print(f"Error instantiating effect '{effect_type_str}' (params: {effect_params}): {e}")
-            import traceback; traceback.print_exc() # More debug info
+        except Exception:
+            logger.exception("Error instantiating effect '%s' (params: %s)", effect_type_str, effect_params) # Logs the traceback too
             return None
 
+    def create_effect(self, effect_data: Dict[str, Any]) -> Optional[Effect]:
+        """Builds the effect described by effect_data ({"type": ..., "params": {...}}), sub-effects included.
+           Identical specs give the same shared instance, so the result must not be modified.
+        """
+        return self._create_effect_instance(effect_data)
+
     def _load_cards(self, filepath: str):
-        """Loads card definitions from a JSON file and populates the draw pile."""
+        """Loads card definitions from a JSON file and populates the draw pile.
+           Parsed card types are cached in memory for the process and reused while the JSON content is unchanged.
+        """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                all_card_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                raw_data = f.read()
         except FileNotFoundError:
-            print(f"Error: Card data file not found at {filepath}. No cards loaded.")
-            return
-        except json.JSONDecodeError:
-            print(f"Error: Could not decode JSON from {filepath}. No cards loaded.")
+            logger.error("Card data file not found at %s. No cards loaded.", filepath)
             return
 
+        source_hash = hashlib.sha256(raw_data).hexdigest()
+        memo_key = (os.path.abspath(filepath), source_hash)
+        card_types = _parsed_card_types.get(memo_key)
+        if card_types is None:
+            try:
+                all_card_data = json_backend.loads(raw_data)
+            except ValueError: # json.JSONDecodeError, orjson and ujson decode errors all derive from it
+                logger.error("Could not decode JSON from %s. No cards loaded.", filepath)
+                return
+            card_types = _parsed_card_types[memo_key] = self._build_card_types(all_card_data)
+
+        for proto, count in card_types:
+            self._cards += [Card(proto, card_id) for card_id in itertools.islice(_card_id_counter, count)]
+        
+        self._draw_end = len(self._cards)
+        logger.info("Deck loaded with %d cards from %d types (Strategy/Component).", self._draw_end, len(card_types))
+
+    def _build_card_types(self, all_card_data: List[Dict[str, Any]]) -> List[Tuple[CardPrototype, int]]:
+        """Turns raw card definitions into (prototype, number of copies) pairs."""
+        card_types: List[Tuple[CardPrototype, int]] = []
         for card_info in all_card_data:
             title = card_info.get("title", "Unnamed Card")
             description = card_info.get("description", "")
             discard_condition = card_info.get("discard_condition", "Сразу")
             count = card_info.get("count", 0)
 
-            # New fields based on the Strategy/Component pattern
-            cost = card_info.get("cost", {})
-            timing = card_info.get("timing", "InTurn")
-            target_needed = card_info.get("target_needed", False)
-            card_type_flags = card_info.get("card_type_flags", [])
-            attributes_granted = card_info.get("attributes_granted", {})
+            # New fields based on the Strategy/Component pattern; "or" also replaces explicit nulls
+            cost = card_info.get("cost") or {}
+            timing = card_info.get("timing") or "InTurn"
+            target_needed = bool(card_info.get("target_needed"))
+            card_type_flags = card_info.get("card_type_flags") or []
+            attributes_granted = card_info.get("attributes_granted") or {}
             effects_data_list = card_info.get("effects", []) # List of effect dictionaries
 
             instantiated_effects: List[Effect] = []
@@ -154,77 +254,105 @@ class Deck:
                     instantiated_effects.append(effect_instance)
             
             if not instantiated_effects and effects_data_list: # Some effects were defined but failed to load
-                print(f"Warning: Card '{title}' had effect definitions but none were successfully instantiated.")
+                logger.warning("Card '%s' had effect definitions but none were successfully instantiated.", title)
             elif not effects_data_list:
-                print(f"Note: Card '{title}' has no defined effects in JSON.")
-
-            for _ in range(count):
-                self.draw_pile.append(Card(
-                    title=title, 
-                    description=description, 
-                    discard_condition=discard_condition,
-                    effects=instantiated_effects, # Pass the list of Effect objects
-                    cost=cost,
-                    timing=timing,
-                    target_needed=target_needed,
-                    card_type_flags=card_type_flags,
-                    attributes_granted=attributes_granted
-                ))
-        
-        print(f"Deck loaded with {len(self.draw_pile)} cards from {len(all_card_data)} types (Strategy/Component)." )
+                logger.debug("Card '%s' has no defined effects in JSON.", title)
+
+            # One shared prototype per card type; each copy only adds its own ID
+            proto = CardPrototype(
+                title=title, 
+                description=description, 
+                discard_condition=discard_condition,
+                effects=instantiated_effects, # Pass the list of Effect objects
+                cost=cost,
+                timing=timing,
+                target_needed=target_needed,
+                card_type_flags=card_type_flags,
+                attributes_granted=attributes_granted
+            )
+            card_types.append((proto, count))
+        return card_types
+
+    @property
+    def draw_pile(self) -> tuple[Card, ...]:
+        """A read-only snapshot of the draw pile, top card first. Use draw() to take cards."""
+        return tuple(self._cards[self._head:self._draw_end])
+
+    @property
+    def discard_pile(self) -> tuple[Card, ...]:
+        """A read-only snapshot of the discard pile, oldest discard first. Use discard() to add cards."""
+        return tuple(self._cards[self._draw_end:])
 
     def shuffle(self):
-        """Shuffles the draw pile."""
-        random.shuffle(self.draw_pile)
-        print("Deck shuffled.")
+        """Shuffles the draw pile in place."""
+        _fisher_yates(self._cards, self._head, self._draw_end)
+        logger.debug("Deck shuffled.")
 
     def draw(self) -> Card | None:
         """Draws a card from the top of the draw pile.
            If the draw pile is empty, it attempts to reshuffle the discard pile.
         """
-        if not self.draw_pile:
-            print("Draw pile empty. Attempting to reshuffle discard pile.")
-            if not self.discard_pile:
-                print("Discard pile is also empty. No cards to draw.")
+        if self._head == self._draw_end:
+            logger.debug("Draw pile empty. Attempting to reshuffle discard pile.")
+            if self._draw_end == len(self._cards):
+                logger.debug("Discard pile is also empty. No cards to draw.")
                 return None
             self.reshuffle_discard_pile()
-            if not self.draw_pile: # Still empty after trying to reshuffle (e.g. discard was also empty)
-                print("No cards available to draw even after reshuffle attempt.")
+            if self._head == self._draw_end: # Still empty after trying to reshuffle (e.g. discard was also empty)
+                logger.debug("No cards available to draw even after reshuffle attempt.")
                 return None
-        
-        return self.draw_pile.pop(0) # Draw from the "top" (index 0)
+
+        card = self._cards[self._head]
+        self._head += 1
+        return card
+
+    def draw_many(self, n: int) -> List[Card]:
+        """Draws up to n cards in one go, reshuffling the discard pile at most once.
+           Returns fewer than n cards only if both piles run out.
+        """
+        cards = self._cards[self._head:min(self._head + n, self._draw_end)]
+        self._head += len(cards)
+        if len(cards) < n and self._draw_end < len(self._cards):
+            logger.debug("Draw pile empty. Attempting to reshuffle discard pile.")
+            self.reshuffle_discard_pile()
+            more_cards = self._cards[self._head:self._head + n - len(cards)]
+            self._head += len(more_cards)
+            cards += more_cards
+        return cards
 
     def discard(self, card: Card):
         """Adds a card to the discard pile."""
         if card:
-            self.discard_pile.append(card)
-            # print(f"Card '{card.title}' discarded.") # Can be verbose
+            self._cards.append(card)
+            # logger.debug("Card '%s' discarded.", card.title) # Can be verbose
         else:
-            print("Warning: Tried to discard a None card.")
+            logger.warning("Tried to discard a None card.")
 
     def needs_reshuffle(self) -> bool:
         """Checks if the draw pile is empty and there are cards in the discard pile."""
-        return not self.draw_pile and bool(self.discard_pile)
+        return self._head == self._draw_end and self._draw_end < len(self._cards)
 
     def reshuffle_discard_pile(self):
         """Moves all cards from the discard pile to the draw pile and shuffles it."""
-        if not self.discard_pile:
-            print("No cards in discard pile to reshuffle.")
+        if self._draw_end == len(self._cards):
+            logger.debug("No cards in discard pile to reshuffle.")
             return
 
-        print(f"Reshuffling {len(self.discard_pile)} cards from discard into draw pile.")
-        self.draw_pile.extend(self.discard_pile)
-        self.discard_pile.clear()
+        logger.debug("Reshuffling %d cards from discard into draw pile.", len(self._cards) - self._draw_end)
+        del self._cards[:self._head] # Drop the slots of already drawn cards, no new list is built
+        self._head = 0
+        self._draw_end = len(self._cards)
         self.shuffle()
 
     def get_draw_pile_size(self) -> int:
-        return len(self.draw_pile)
+        return self._draw_end - self._head
 
     def get_discard_pile_size(self) -> int:
-        return len(self.discard_pile)
+        return len(self._cards) - self._draw_end
 
 # Example Usage:
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s") # Show the deck's debug messages
     # Create a dummy cards.json for testing if it doesn't exist
     # You should have your actual cards.json for this to work properly
     try:
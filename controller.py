@@ -0,0 +1,112 @@
+# This file defines how players make decisions. The game asks a player's controller
+# instead of calling input() itself, so games can also be driven by scripts or AI (e.g. batch simulations).
+from typing import List, Optional, Protocol, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from card import Card
+    from game import Game
+    from player import Player
+
+
+class PlayerController(Protocol):
+    """Decisions the game needs from a player.
+       Index-returning methods may raise ValueError on unreadable input; the game treats that as an invalid choice.
+    """
+
+    def decide_reroll(self, player: 'Player', game: 'Game') -> bool: ...
+
+    def decide_move(self, player: 'Player', game: 'Game', total_movement: int) -> Optional[Tuple[int, int]]:
+        """Target (row, col), or None to skip movement."""
+        ...
+
+    def decide_action(self, player: 'Player', game: 'Game') -> str:
+        """'play', 'fight' or 'skip'."""
+        ...
+
+    def decide_card_to_play(self, player: 'Player', game: 'Game') -> Optional[int]:
+        """Index into player.cards_in_hand, or None to cancel."""
+        ...
+
+    def decide_card_target(self, player: 'Player', game: 'Game', card: 'Card') -> int:
+        """Index into game.players."""
+        ...
+
+    def decide_fight_target(self, player: 'Player', game: 'Game', opponents: List['Player']) -> Optional[int]:
+        """Index into opponents, or None to skip the fight."""
+        ...
+
+    def decide_fight_reward(self, winner: 'Player', game: 'Game', loser: 'Player') -> str:
+        """'food' or 'card'."""
+        ...
+
+    def decide_reveal_agenda(self, player: 'Player', game: 'Game') -> bool: ...
+
+
+class HumanController:
+    """Asks the person at the keyboard. The only controller that calls input()."""
+
+    def decide_reroll(self, player: 'Player', game: 'Game') -> bool:
+        return input("You have a re-roll ability. Use it? (yes/no): ").lower() == 'yes'
+
+    def decide_move(self, player: 'Player', game: 'Game', total_movement: int) -> Optional[Tuple[int, int]]:
+        print(f"Current position: ({player.row}, {player.col})")
+        move_str = input(f"{player.id}, enter new position 'row,col' (or 'skip'): ")
+        if move_str.lower() == 'skip':
+            return None
+        new_r, new_c = map(int, move_str.split(','))
+        return new_r, new_c
+
+    def decide_action(self, player: 'Player', game: 'Game') -> str:
+        return input(f"{player.id}, take action: play card ('play'), fight ('fight'), skip ('skip'): ").lower()
+
+    def decide_card_to_play(self, player: 'Player', game: 'Game') -> Optional[int]:
+        print("Your cards:")
+        for i, card_in_hand in enumerate(player.cards_in_hand):
+            print(f"  {i}: {card_in_hand.title} (Cost: {card_in_hand.cost})") # Show cost
+        card_idx_str = input("Enter index of card to play (or 'cancel'): ")
+        if card_idx_str.lower() == 'cancel':
+            return None
+        return int(card_idx_str)
+
+    def decide_card_target(self, player: 'Player', game: 'Game', card: 'Card') -> int:
+        return int(input(f"Card '{card.title}' needs a target. Enter player index (0-{len(game.players)-1}), not you ({game.current_player_index}): "))
+
+    def decide_fight_target(self, player: 'Player', game: 'Game', opponents: List['Player']) -> Optional[int]:
+        target_idx_str = input(f"Fight with whom? {[f'{i}:{opp.id}' for i, opp in enumerate(opponents)]} (index or 'skip'): ")
+        if target_idx_str.lower() == 'skip':
+            return None
+        return int(target_idx_str)
+
+    def decide_fight_reward(self, winner: 'Player', game: 'Game', loser: 'Player') -> str:
+        return input(f"{winner.id}, take 2 food ('food') or 1 random card ('card') from {loser.id}?: ").lower()
+
+    def decide_reveal_agenda(self, player: 'Player', game: 'Game') -> bool:
+        return input(f"{player.id}, your agenda is '{player.secret_agenda.title}'. Attempt to reveal? (yes/no): ").lower() == 'yes'
+
+
+class PassiveController:
+    """Never takes optional actions. Placeholder for non-human players until real AI is written."""
+
+    def decide_reroll(self, player: 'Player', game: 'Game') -> bool:
+        return False
+
+    def decide_move(self, player: 'Player', game: 'Game', total_movement: int) -> Optional[Tuple[int, int]]:
+        return None
+
+    def decide_action(self, player: 'Player', game: 'Game') -> str:
+        return 'skip'
+
+    def decide_card_to_play(self, player: 'Player', game: 'Game') -> Optional[int]:
+        return None
+
+    def decide_card_target(self, player: 'Player', game: 'Game', card: 'Card') -> int:
+        raise ValueError("PassiveController does not choose card targets")
+
+    def decide_fight_target(self, player: 'Player', game: 'Game', opponents: List['Player']) -> Optional[int]:
+        return None
+
+    def decide_fight_reward(self, winner: 'Player', game: 'Game', loser: 'Player') -> str:
+        return 'food'
+
+    def decide_reveal_agenda(self, player: 'Player', game: 'Game') -> bool:
+        return False
@@ -1,6 +1,7 @@
 import openpyxl
 import sys
-import json
+
+import json_backend
 
 CARDS_FILE_PATH = 'cards.json'
 SECRET_AGENDAS_FILE_PATH = 'secret_agendas.json'
@@ -11,12 +12,12 @@ OUTPUT_PATH = "cards.xlsx"
 
 def load_json_data(file_path):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return json_backend.loads(f.read())
     except FileNotFoundError:
         print(f"Error: File not found - {file_path}", file=sys.stderr)
         return None
-    except json.JSONDecodeError:
+    except ValueError: # json.JSONDecodeError, orjson and ujson decode errors all derive from it
         print(f"Error: Could not decode JSON from - {file_path}", file=sys.stderr)
         return None
 
@@ -38,11 +39,8 @@ def read_cards(cards_path, secret_agendas_path):
         if not isinstance(count, int) or count < 1:
             count = 1  # Ensure count is at least 1
 
-        for i in range(count):
-            all_cards_for_csv.append([
-                title,
-                description,
-            ])
+        # The row is shared by all copies; write_cards only reads it
+        all_cards_for_csv.extend([[title, description]] * count)
 
     for agenda in secret_agendas_data:
         title = agenda.get("title", "Без названия")
@@ -65,13 +63,17 @@ def write_cards(card_data, template_path, output_path):
 
     print(f"Processing sheet: {sheet.title}")
 
+    # Collect (row, col, value) first and write in row-major order, which is how openpyxl stores cells
+    cell_values = []
     for card_index, (title, desc) in enumerate(card_data):
         card_row = (card_index % TEMPLATE_ROWS) * 2 + 1
         card_col = card_index // TEMPLATE_ROWS + 1
-        cell_title = sheet.cell(card_row, card_col)
-        cell_desc = sheet.cell(card_row + 1, card_col)
-        cell_title.value = title
-        cell_desc.value = desc
+        cell_values.append((card_row, card_col, title))
+        cell_values.append((card_row + 1, card_col, desc))
+    cell_values.sort() # (row, col) pairs are unique, so values are never compared
+
+    for row, col, value in cell_values:
+        sheet.cell(row=row, column=col, value=value)
 
     workbook.save(output_path)
     workbook.close()
@@ -0,0 +1,11 @@
+import json
+
+# Prefer a faster JSON parser when one is installed; all of them accept bytes in loads()
+# and raise ValueError subclasses on malformed input.
+try:
+    from orjson import loads
+except ImportError:
+    try:
+        from ujson import loads
+    except ImportError:
+        loads = json.loads
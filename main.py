@@ -1,3 +1,5 @@
+import logging
+
 print("Welcome to Alley Cats!")
 
 def main():
@@ -5,4 +7,5 @@ def main():
     pass
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s") # Show the game's narration on the console
+    main()
@@ -1,78 +1,90 @@
 # This file will contain functions to parse map.txt and represent the game board. 
-from board_elements import Cell, Wall, Kiosk, Basement, StudentCell, CookCell, LibrarianCell
+from board_elements import Cell, CellType, Wall, Kiosk, Basement, StudentCell, CookCell, LibrarianCell
 
-def load_map(filepath: str) -> list[list[Cell]]:
+# One byte per map symbol (see board_elements.CellType). Anything else is a traversable EMPTY cell.
+SYMBOL_TO_CODE: dict[str, int] = {
+    '.': CellType.WALL,
+    'K': CellType.KIOSK,
+    'B': CellType.BASEMENT,
+    'S': CellType.STUDENT,
+    'C': CellType.COOK,
+    'L': CellType.LIBRARIAN,
+}
+_CODE_TO_CELL_CLASS = {
+    CellType.WALL: Wall,
+    CellType.KIOSK: Kiosk,
+    CellType.BASEMENT: Basement,
+    CellType.STUDENT: StudentCell,
+    CellType.COOK: CookCell,
+    CellType.LIBRARIAN: LibrarianCell,
+}
+
+def load_map_codes(filepath: str) -> tuple[bytearray, int, int, dict[int, str]]:
     """
-    Loads the game map from a text file and represents it as a grid of Cell objects.
+    Loads the game map from a text file as a flat, row-major array of CellType codes, one byte per cell.
+    Cell (r, c) is at index r * num_cols + c. Short rows are padded with EMPTY (0) cells.
 
     Args:
         filepath: The path to the map file.
 
     Returns:
-        A list of lists of Cell objects.
-        Returns an empty list if the file is not found or is empty.
+        (codes, num_rows, num_cols, other_symbols), where other_symbols maps the index of every
+        EMPTY cell whose symbol is not blank (e.g. an unexpected 'B ') to that symbol.
+        codes is empty if the file is not found or is empty.
     """
-    game_board: list[list[Cell]] = []
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            for r, line in enumerate(f):
-                stripped_line = line.strip('\n') # Keep trailing tabs if any, just strip newline
-                if not stripped_line and r == 0 and not game_board: # Handle completely empty file scenario better
-                    continue 
-                
-                row_cells_str = stripped_line.split('\t')
-                row_objects: list[Cell] = []
-                for c, symbol in enumerate(row_cells_str):
-                    if symbol == '.':
-                        row_objects.append(Wall(r, c))
-                    elif symbol == 'K':
-                        row_objects.append(Kiosk(r, c))
-                    elif symbol == 'B':
-                        row_objects.append(Basement(r, c))
-                    elif symbol == 'S':
-                        row_objects.append(StudentCell(r, c))
-                    elif symbol == 'C':
-                        row_objects.append(CookCell(r, c))
-                    elif symbol == 'L':
-                        row_objects.append(LibrarianCell(r, c))
-                    elif symbol == '' or symbol.isspace(): # Empty string from split or just whitespace
-                        # This is a traversable empty path
-                        row_objects.append(Cell(r, c, ' ')) # Represent empty path with a space symbol
-                    else:
-                        # Default to a generic Cell for any other unexpected symbols, treating them as traversable
-                        # Or we could raise an error for unknown symbols if strict parsing is needed.
-                        # print(f"Warning: Unknown symbol '{symbol}' at ({r},{c}). Treating as traversable Cell.")
-                        row_objects.append(Cell(r, c, symbol))
-                game_board.append(row_objects)
-            
-            # Ensure all rows have the same number of columns for a consistent grid
-            if game_board:
-                max_cols = 0
-                # First pass to find the maximum number of columns based on actual content
-                for r_idx, row in enumerate(game_board):
-                    # Count actual cell objects, not just string length, to be accurate with Cell instantiation
-                    current_cols = len(row)
-                    if current_cols > 0:
-                         max_cols = max(max_cols, current_cols)
-                    # If a row was completely empty in the file leading to an empty list of objects, 
-                    # it might need padding if other rows have content. However, split('\t') on an empty line
-                    # gives [''], so len(row_cells_str) would be 1, and one Cell(r,c,' ') is added.
-                    # This handles lines with only tabs correctly too.
-
-                # Second pass to pad rows
-                for r_idx, row in enumerate(game_board):
-                    while len(row) < max_cols:
-                        # Add empty traversable cells for padding
-                        row.append(Cell(r_idx, len(row), ' '))
-
-            return game_board
-            
+            lines = f.read().splitlines() # Keep trailing tabs if any, just strip newlines
     except FileNotFoundError:
         print(f"Error: Map file not found at {filepath}")
-        return []
+        return bytearray(), 0, 0, {}
     except Exception as e:
         print(f"An error occurred while loading the map: {e}")
-        return []
+        return bytearray(), 0, 0, {}
+
+    if lines and not lines[0]: # Handle completely empty file scenario better
+        del lines[0]
+    # Width comes from the tab count, so rows are split only once, while filling.
+    # split('\t') on an empty line gives [''], so every row has at least one (empty) cell.
+    num_cols = max((line.count('\t') for line in lines), default=-1) + 1
+
+    codes = bytearray(len(lines) * num_cols) # Zero-filled, so short rows need no padding pass
+    other_symbols: dict[int, str] = {}
+    for r, line in enumerate(lines):
+        base = r * num_cols
+        for c, symbol in enumerate(line.split('\t')):
+            code = SYMBOL_TO_CODE.get(symbol)
+            if code is not None:
+                codes[base + c] = code
+            elif symbol and not symbol.isspace():
+                # Default to a generic Cell for any other unexpected symbols, treating them as traversable
+                other_symbols[base + c] = symbol
+    return codes, len(lines), num_cols, other_symbols
+
+def build_board(codes: bytearray, num_rows: int, num_cols: int, other_symbols: dict[int, str]) -> list[list[Cell]]:
+    """Creates the grid of Cell objects described by load_map_codes' output."""
+    game_board: list[list[Cell]] = []
+    for r in range(num_rows):
+        base = r * num_cols
+        game_board.append([
+            _CODE_TO_CELL_CLASS[code](r, c) if code else Cell(r, c, other_symbols.get(base + c, ' ')) # Empty path is a space
+            for c, code in enumerate(codes[base:base + num_cols])
+        ])
+    return game_board
+
+def load_map(filepath: str) -> list[list[Cell]]:
+    """
+    Loads the game map from a text file and represents it as a grid of Cell objects.
+    All rows have the same number of columns.
+
+    Args:
+        filepath: The path to the map file.
+
+    Returns:
+        A list of lists of Cell objects.
+        Returns an empty list if the file is not found or is empty.
+    """
+    return build_board(*load_map_codes(filepath))
 
 # Example usage (can be removed or kept for testing)
 if __name__ == '__main__':
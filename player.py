@@ -1,9 +1,16 @@
 # This file will define the Player class and related functionalities. 
-from typing import List, Dict, Any, Optional, TYPE_CHECKING, Tuple
+import logging
+import sys
+from collections import Counter
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, TYPE_CHECKING, Tuple
+
+from controller import PlayerController, HumanController, PassiveController
 
 # Conditional imports to avoid circular dependencies during type hinting
 if TYPE_CHECKING:
     from card import Card
+    from effects import Effect
     from agenda import AgendaCard
     from board_elements import OwnerCell # For tracking visits
 
@@ -11,50 +18,131 @@ OWNER_STUDENT = "Student"
 OWNER_COOK = "Cook"
 OWNER_LIBRARIAN = "Librarian"
 ALL_OWNERS = [OWNER_STUDENT, OWNER_COOK, OWNER_LIBRARIAN]
+OWNER_INDEX = {owner: i for i, owner in enumerate(ALL_OWNERS)} # Position of each owner in Player.trust
+
+logger = logging.getLogger(__name__)
+
+class ArmedEntry:
+    """An armed card with everything the game needs when its trigger fires, read out of the card's params once.
+       Entries are read-only after construction, so copies of a player (see Player.clone_into) can share them.
+    """
+    __slots__ = ('card', 'play_context', 'event_type', 'cell_type_symbol', 'played_on_owner_name',
+                 'triggered_effects', 'self_discard')
+
+    def __init__(self, card: 'Card', play_context: Dict[str, Any]):
+        play_context = MappingProxyType(dict(play_context)) # Snapshot; later changes to the caller's dict don't leak in
+        arm_params = card.effects[0].params if card.effects else {}
+        trigger_condition = arm_params.get("trigger_condition", {})
+        self.card = card
+        self.play_context: Mapping[str, Any] = play_context
+        self.event_type: Optional[str] = trigger_condition.get("type")
+        self.cell_type_symbol: Optional[str] = trigger_condition.get("cell_type_symbol") # For "VisitedCellType"
+        self.played_on_owner_name: Optional[str] = play_context.get("played_on_owner_name")
+        # (shared effect, its spec, owner_name_from_context or None). The effects are never modified here;
+        # the game builds an owner-specific effect from the spec when the card fires.
+        arm_effect = card.effects[0] if card.effects else None
+        self.triggered_effects: Tuple[Tuple['Effect', Dict[str, Any], Any], ...] = tuple(
+            (eff, eff_data, eff.params.get("owner_name_from_context"))
+            for eff, eff_data in zip(getattr(arm_effect, "triggered_effects_instances", ()), # Only set on ArmDelayedEffect
+                                     getattr(arm_effect, "triggered_effects_data", ()))
+        )
+        self.self_discard: bool = arm_params.get("self_discard_on_trigger", False)
+
+class PersistentBonus:
+    """Extra food from a revealed agenda, granted when the player lands on a given owner's cell."""
+    __slots__ = ('agenda_title', 'food_amount', 'needs_food_from_cell')
+
+    def __init__(self, agenda_title: str, food_amount: int, needs_food_from_cell: bool):
+        self.agenda_title: str = agenda_title
+        self.food_amount: int = food_amount
+        self.needs_food_from_cell: bool = needs_food_from_cell # Only when the cell itself gave food this visit
 
 class Player:
     """Represents a player (a cat) in the Alley Cats game."""
 
     INITIAL_FOOD = 5
     INITIAL_CARDS_IN_HAND = 0 # Cards are drawn during game setup
-
-    def __init__(self, player_id: str, initial_row: int, initial_col: int, is_human: bool = True):
+    # Persistent effects that prevent gaining trust. Interned like card titles (see CardPrototype)
+    TRUST_GAIN_BLOCKERS = frozenset(map(sys.intern, ("Дикий кот", "Бешеность")))
+    FIGHT_TRUST_LOSS_TITLE = sys.intern("Гроза дворов") # The loser of a fight against its holder loses trust
+
+    __slots__ = ('id', 'idx', 'num_cols', 'row', 'col', 'pos', 'is_human', 'controller',
+                 'food', 'cards_in_hand', 'trust', 'max_trust_value', 'max_trust_owner',
+                 'active_titles', 'active_title_ids', 'active_title_names', 'fight_trust_loss_titles', 'persistent_effects', 'persistent_effect_ids', 'persistent_effect_titles',
+                 'secret_agenda', 'agenda_conditions_by_type', 'revealed_persistent_agendas', 'persistent_bonuses_by_owner',
+                 'visited_special_cells_this_turn', 'visit_counts_this_game', 'used_card_types_log', 'used_card_counts',
+                 'action_log_this_turn', 'has_one_time_reroll_ability',
+                 'armed_delayed_effects_by_type', 'armed_card_event_types', 'temporary_bonuses_this_turn',
+                 '_bonuses_dirty', '_cached_move_bonus', '_cached_fight_bonus', '_cached_wall_pass')
+
+    def __init__(self, player_id: str, initial_row: int, initial_col: int, is_human: bool = True,
+                 controller: Optional[PlayerController] = None, *, num_cols: int):
         self.id: str = player_id
+        self.idx: int = 0 # Seat index in Game.players, assigned by the game; used for occupancy bitmasks
+        self.num_cols: int = num_cols # Board width, used to pack (row, col) into a single int
         self.row: int = initial_row
         self.col: int = initial_col
+        self.pos: int = initial_row * num_cols + initial_col # Kept in lockstep with row/col by update_position
         self.is_human: bool = is_human
+        # Makes this player's decisions; the game never calls input() itself
+        self.controller: PlayerController = controller if controller is not None else (HumanController() if is_human else PassiveController())
 
         self.food: int = Player.INITIAL_FOOD
         self.cards_in_hand: List['Card'] = [] # Should be list[Card] later
-        self.trust_levels: Dict[str, int] = {owner: 0 for owner in ALL_OWNERS}
+        self.trust: List[int] = [0] * len(ALL_OWNERS) # Trust per owner, indexed by OWNER_INDEX. Change only via gain_trust/lose_trust
+        # Highest trust level and its owner, maintained by gain_trust/lose_trust for the win check
+        self.max_trust_value: int = 0
+        self.max_trust_owner: Optional[str] = None
         
         self.active_titles: List['Card'] = [] # Should be list[Card] later, for Title cards
+        self.active_title_ids: set[int] = set() # Card ids in active_titles, for O(1) membership checks
+        self.active_title_names: frozenset = frozenset() # Titles of active_titles, kept by add_title/remove_title
+        self.fight_trust_loss_titles: List['Card'] = [] # Titles making a beaten opponent lose trust, kept by add_title/remove_title
         self.persistent_effects: List['Card'] = [] # Should be list[Card] for cards like Дикий Кот
+        self.persistent_effect_ids: set[int] = set() # Card ids in persistent_effects
+        self.persistent_effect_titles: frozenset = frozenset() # Titles of persistent_effects, kept by add/remove_persistent_effect
 
         # Agenda related attributes
         self.secret_agenda: Optional['AgendaCard'] = None
+        # The secret agenda's objective conditions grouped by condition class, built once in set_secret_agenda
+        self.agenda_conditions_by_type: Dict[type, List[Any]] = {}
         self.revealed_persistent_agendas: List['AgendaCard'] = [] # For agendas that give ongoing bonuses
+        self.persistent_bonuses_by_owner: Dict[str, List[PersistentBonus]] = {} # Their cell bonuses, keyed by owner name
 
         # For game rule: "Бонусы от посещения клеток ... можно получить только один раз за ход для каждой такой уникальной клетки"
-        self.visited_special_cells_this_turn: set[tuple[int, int]] = set()
+        self.visited_special_cells_this_turn: set[int] = set() # Packed positions, row * num_cols + col
 
         # Stats for Agenda Objective Tracking
         self.visit_counts_this_game: Dict[str, int] = {owner: 0 for owner in ALL_OWNERS} # Tracks visits to Owner cells
         # self.visit_counts_this_game["Kiosk"] = 0 # Example for other cell types if needed
         # self.visit_counts_this_game["Basement"] = 0
-        self.used_card_types_log: List[str] = [] # Log titles of cards successfully used/played
+        self.used_card_types_log: List[str] = [] # Log titles of cards successfully used/played, in order
+        self.used_card_counts: Counter = Counter() # Same titles counted, so count_card_usage needs no scan
         self.action_log_this_turn: List[Dict[str, Any]] = [] # For complex turn-specific actions, e.g. {"type": "GaveFood", "amount": 2}
         
         # Agenda/Card granted abilities
         self.has_one_time_reroll_ability: bool = False
         # Add other specific ability flags as needed by rewards/effects
 
-        self.armed_delayed_effects: List[Tuple[Card, Dict[str, Any]]] = [] # Store card and its play context
+        # Armed cards bucketed by the event type that triggers them
+        self.armed_delayed_effects_by_type: Dict[Optional[str], List[ArmedEntry]] = {}
+        self.armed_card_event_types: Dict[int, Optional[str]] = {} # Card id -> its bucket key above
         self.temporary_bonuses_this_turn: List[Dict[str, Any]] = [] # For cards like "Быстрые лапки"
+        # Movement/fight/wall-pass bonuses, recomputed on the next query after titles, effects or temporary bonuses change.
+        # Change those lists only through the add/remove methods, which mark the cache dirty.
+        self._bonuses_dirty: bool = True
+        self._cached_move_bonus: int = 0
+        self._cached_fight_bonus: int = 0
+        self._cached_wall_pass: bool = False
 
     def __repr__(self) -> str:
+        # Kept cheap, since logging and debuggers call it implicitly; describe() has the full dump
+        return f"Player(id={self.id!r}, pos=({self.row},{self.col}), food={self.food})"
+
+    def describe(self) -> str:
+        """Detailed, multi-field description of the player's state, for debugging."""
         agenda_title = self.secret_agenda.title if self.secret_agenda else "None"
-        armed_effects_repr = [(card.title, ctx) for card, ctx in self.armed_delayed_effects]
+        armed_effects_repr = [(entry.card.title, dict(entry.play_context)) for bucket in self.armed_delayed_effects_by_type.values() for entry in bucket]
         return (
             f"Player(id='{self.id}', pos=({self.row},{self.col}), food={self.food}, "
             f"cards_count={len(self.cards_in_hand)}, trust={self.trust_levels}, "
@@ -64,206 +152,283 @@ class Player:
             f"reroll_ability={self.has_one_time_reroll_ability})"
         )
 
+    # How clone_into copies each slot; keep these in step with __slots__.
+    # Values that are immutable or shared between copies (cards, agendas, the controller) are assigned as-is.
+    _CLONE_ASSIGNED = ('id', 'idx', 'num_cols', 'row', 'col', 'pos', 'is_human', 'controller',
+                       'food', 'max_trust_value', 'max_trust_owner', 'active_title_names', 'persistent_effect_titles',
+                       'secret_agenda', 'agenda_conditions_by_type', 'has_one_time_reroll_ability',
+                       '_bonuses_dirty', '_cached_move_bonus', '_cached_fight_bonus', '_cached_wall_pass')
+    _CLONE_LISTS = ('cards_in_hand', 'trust', 'active_titles', 'fight_trust_loss_titles', 'persistent_effects',
+                    'revealed_persistent_agendas', 'used_card_types_log', 'action_log_this_turn', 'temporary_bonuses_this_turn')
+    _CLONE_SETS_AND_DICTS = ('active_title_ids', 'persistent_effect_ids', 'visited_special_cells_this_turn',
+                             'visit_counts_this_game', 'used_card_counts', 'armed_card_event_types')
+    _CLONE_DICTS_OF_LISTS = ('persistent_bonuses_by_owner', 'armed_delayed_effects_by_type')
+
+    def clone_into(self, other: 'Player'):
+        """Copies this player's state into another, already allocated Player, reusing its containers,
+           so lookahead searches can work on a pool of players instead of deep copies.
+           Cards, agendas, armed entries and bonuses are shared with the copy, not duplicated; none of them
+           is modified while playing (triggered effects are built fresh when they fire), so sharing is safe.
+        """
+        for name in Player._CLONE_ASSIGNED:
+            setattr(other, name, getattr(self, name))
+        for name in Player._CLONE_LISTS:
+            getattr(other, name)[:] = getattr(self, name)
+        for name in Player._CLONE_SETS_AND_DICTS:
+            target = getattr(other, name)
+            target.clear()
+            target.update(getattr(self, name))
+        for name in Player._CLONE_DICTS_OF_LISTS:
+            target = getattr(other, name)
+            target.clear()
+            for key, items in getattr(self, name).items():
+                target[key] = list(items) # Buckets are edited in place, so each copy needs its own
+
     def update_position(self, new_row: int, new_col: int):
         """Updates the player's position on the board."""
         self.row = new_row
         self.col = new_col
+        self.pos = new_row * self.num_cols + new_col
 
     def gain_food(self, amount: int):
         """Increases the player's food tokens."""
         if amount < 0:
-            print(f"Warning: Tried to gain negative food ({amount}). Ignoring.")
+            logger.warning("Tried to gain negative food (%s). Ignoring.", amount)
             return
         self.food += amount
-        print(f"> {self.id} gained {amount} food. Total: {self.food}")
+        logger.info("> %s gained %s food. Total: %s", self.id, amount, self.food)
 
     def lose_food(self, amount: int) -> bool:
         """Decreases the player's food tokens. Returns True if successful, False otherwise."""
         if amount < 0:
-            print(f"Warning: Tried to lose negative food ({amount}). Ignoring.")
+            logger.warning("Tried to lose negative food (%s). Ignoring.", amount)
             return True # Or False, depending on strictness
         if self.food >= amount:
             self.food -= amount
-            print(f"> {self.id} lost {amount} food. Remaining: {self.food}")
+            logger.info("> %s lost %s food. Remaining: %s", self.id, amount, self.food)
             return True
         else:
-            print(f"> {self.id} does not have enough food to lose {amount}. Has: {self.food}")
+            logger.info("> %s does not have enough food to lose %s. Has: %s", self.id, amount, self.food)
             return False
 
     def add_card_to_hand(self, card): # card type will be Card later
         """Adds a card to the player's hand."""
         if card:
             self.cards_in_hand.append(card)
-            print(f"> {self.id} received card: {card.title}")
+            logger.info("> %s received card: %s", self.id, card.title)
 
     def remove_card_from_hand(self, card): # card type will be Card later
         """Removes a specific card from the player's hand. Returns True if successful."""
+        # Hand order carries no meaning, so swap the last card into the gap instead of shifting the tail
+        hand = self.cards_in_hand
         try:
-            self.cards_in_hand.remove(card)
-            print(f"> {self.id} removed card: {card.title} from hand.")
+            i = hand.index(card)
+            hand[i] = hand[-1]
+            hand.pop()
+            logger.info("> %s removed card: %s from hand.", self.id, card.title)
             return True
         except ValueError:
-            print(f"Warning: Card {card.title} not found in {self.id}'s hand to remove.")
+            logger.warning("Card %s not found in %s's hand to remove.", card.title, self.id)
             return False
 
+    @property
+    def trust_levels(self) -> Mapping[str, int]:
+        """Read-only trust per owner name; assigning to it raises TypeError.
+           gain_trust and lose_trust are the only ways to change trust: they also keep
+           max_trust_value/max_trust_owner, which the win check relies on, up to date.
+        """
+        return MappingProxyType(dict(zip(ALL_OWNERS, self.trust)))
+
+    def trust_with(self, owner_name: str) -> int:
+        """Trust with one owner, 0 for unknown owner names."""
+        owner_idx = OWNER_INDEX.get(owner_name)
+        return self.trust[owner_idx] if owner_idx is not None else 0
+
     def gain_trust(self, owner_name: str, amount: int):
         """Increases trust with a specific owner."""
-        if owner_name not in self.trust_levels:
-            print(f"Error: Unknown owner '{owner_name}'. Cannot gain trust.")
+        owner_idx = OWNER_INDEX.get(owner_name)
+        if owner_idx is None:
+            logger.error("Unknown owner '%s'. Cannot gain trust.", owner_name)
             return
         if amount < 0:
-            print(f"Warning: Tried to gain negative trust ({amount}) for {owner_name}. Ignoring.")
+            logger.warning("Tried to gain negative trust (%s) for %s. Ignoring.", amount, owner_name)
             return
         
         # Rule: "Дикий кот не может получать новые очки доверия"
         # Rule: "Бешеность не может получать новые очки доверия"
         # This check should ideally be in a helper method like self.can_gain_trust()
         # For now, simple check, will be refined when cards are implemented
-        if any(effect.title == "Дикий кот" for effect in self.persistent_effects) or \
-           any(effect.title == "Бешеность" for effect in self.persistent_effects):
-            print(f"> {self.id} has an effect preventing trust gain.")
+        if self.has_active_effect_preventing_trust_gain():
+            logger.info("> %s has an effect preventing trust gain.", self.id)
             return
 
-        self.trust_levels[owner_name] += amount
-        print(f"> {self.id} gained {amount} trust with {owner_name}. Total: {self.trust_levels[owner_name]}")
+        self.trust[owner_idx] += amount
+        if self.trust[owner_idx] > self.max_trust_value:
+            self.max_trust_value = self.trust[owner_idx]
+            self.max_trust_owner = owner_name
+        logger.info("> %s gained %s trust with %s. Total: %s", self.id, amount, owner_name, self.trust[owner_idx])
         # Check for win condition here or in the game loop
 
     def lose_trust(self, owner_name: str, amount: int):
         """Decreases trust with a specific owner."""
-        if owner_name not in self.trust_levels:
-            print(f"Error: Unknown owner '{owner_name}'. Cannot lose trust.")
+        owner_idx = OWNER_INDEX.get(owner_name)
+        if owner_idx is None:
+            logger.error("Unknown owner '%s'. Cannot lose trust.", owner_name)
             return
         if amount < 0:
-            print(f"Warning: Tried to lose negative trust ({amount}) for {owner_name}. Ignoring.")
+            logger.warning("Tried to lose negative trust (%s) for %s. Ignoring.", amount, owner_name)
             return
-        self.trust_levels[owner_name] = max(0, self.trust_levels[owner_name] - amount)
-        print(f"> {self.id} lost {amount} trust with {owner_name}. Remaining: {self.trust_levels[owner_name]}")
+        self.trust[owner_idx] = max(0, self.trust[owner_idx] - amount)
+        if owner_name == self.max_trust_owner:
+            # The leading owner lost trust, another one may be ahead now
+            self.max_trust_value = max(self.trust)
+            self.max_trust_owner = ALL_OWNERS[self.trust.index(self.max_trust_value)]
+        logger.info("> %s lost %s trust with %s. Remaining: %s", self.id, amount, owner_name, self.trust[owner_idx])
 
     def add_title(self, title_card):
         """Adds a title card to the player's active titles."""
         # Remove if already present to avoid duplicates, though titles are unique in game state
-        if title_card not in self.active_titles:
+        if title_card.id not in self.active_title_ids:
+            self.active_title_ids.add(title_card.id)
             self.active_titles.append(title_card)
-            print(f"> {self.id} gained title: {title_card.title}")
+            self._bonuses_dirty = True
+            self.active_title_names = self.active_title_names | {title_card.title}
+            self._refresh_fight_trust_loss_titles()
+            logger.info("> %s gained title: %s", self.id, title_card.title)
 
     def remove_title(self, title_card):
         """Removes a title card from the player's active titles."""
-        try:
-            self.active_titles.remove(title_card)
-            print(f"> {self.id} lost title: {title_card.title}")
-        except ValueError:
-            pass # Already removed or wasn't there
+        if title_card.id not in self.active_title_ids:
+            return # Already removed or wasn't there
+        self.active_title_ids.discard(title_card.id)
+        self.active_titles.remove(title_card)
+        self._bonuses_dirty = True
+        self.active_title_names = frozenset(t.title for t in self.active_titles)
+        self._refresh_fight_trust_loss_titles()
+        logger.info("> %s lost title: %s", self.id, title_card.title)
+
+    def _refresh_fight_trust_loss_titles(self):
+        # "Гроза дворов": the loser of a fight against this player loses trust
+        self.fight_trust_loss_titles[:] = [
+            t for t in self.active_titles
+            if t.title == Player.FIGHT_TRUST_LOSS_TITLE and t.attributes_granted.get("OnSuccessfulFightInflictTrustLoss")
+        ]
             
     def add_persistent_effect(self, effect_card):
         """Adds a persistent effect card (like Дикий Кот)."""
-        if effect_card not in self.persistent_effects:
+        if effect_card.id not in self.persistent_effect_ids:
+            self.persistent_effect_ids.add(effect_card.id)
             self.persistent_effects.append(effect_card)
-            print(f"> {self.id} now has persistent effect: {effect_card.title}")
+            self._bonuses_dirty = True
+            self.persistent_effect_titles = self.persistent_effect_titles | {effect_card.title}
+            logger.info("> %s now has persistent effect: %s", self.id, effect_card.title)
 
     def remove_persistent_effect(self, effect_card_title: str) -> bool:
         """Removes a persistent effect card by its title. Returns True if removed."""
-        initial_len = len(self.persistent_effects)
-        self.persistent_effects = [card for card in self.persistent_effects if card.title != effect_card_title]
-        removed = len(self.persistent_effects) < initial_len
-        if removed: print(f"> {self.id} lost effect: {effect_card_title}")
-        return removed
+        if effect_card_title not in self.persistent_effect_titles:
+            return False # Nothing to rebuild
+        # Edited in place, so the containers (and anyone holding them) stay the same objects
+        self.persistent_effects[:] = [card for card in self.persistent_effects if card.title != effect_card_title]
+        self.persistent_effect_ids.clear()
+        self.persistent_effect_ids.update(card.id for card in self.persistent_effects)
+        self._bonuses_dirty = True
+        self.persistent_effect_titles = frozenset(card.title for card in self.persistent_effects)
+        logger.info("> %s lost effect: %s", self.id, effect_card_title)
+        return True
+
+    def has_title(self, title: str) -> bool:
+        return title in self.active_title_names
+
+    def has_persistent_effect(self, title: str) -> bool:
+        return title in self.persistent_effect_titles
 
     def start_new_turn(self):
         """Resets turn-specific player state."""
         self.visited_special_cells_this_turn.clear()
         self.action_log_this_turn.clear() # Clear turn-specific action log
         self.temporary_bonuses_this_turn.clear() # Clear temporary bonuses at start of new turn
-        print(f"> Starting new turn for {self.id}. (Turn-specific stats cleared)")
+        self._bonuses_dirty = True
+        logger.info("> Starting new turn for %s. (Turn-specific stats cleared)", self.id)
 
     def has_visited_cell_this_turn(self, row: int, col: int) -> bool:
         """Checks if the player has already gained a benefit from a specific cell this turn."""
-        return (row, col) in self.visited_special_cells_this_turn
+        return row * self.num_cols + col in self.visited_special_cells_this_turn
 
     def record_cell_visit_this_turn(self, row: int, col: int):
         """Records that the player has gained a benefit from a cell this turn."""
-        self.visited_special_cells_this_turn.add((row, col))
+        self.visited_special_cells_this_turn.add(row * self.num_cols + col)
 
-    def get_movement_bonus(self) -> int:
-        bonus = 0
+    def _recompute_bonuses(self):
+        """Walks titles, persistent effects and temporary bonuses once to refresh the cached bonus values."""
+        move_bonus = 0
+        fight_bonus = 0
+        wall_pass = False
         # Check active titles (from Cards)
         for title_card in self.active_titles:
-            if title_card.attributes_granted.get("MovementBonus"): # e.g. {"MovementBonus": 2}
-                bonus += int(title_card.attributes_granted["MovementBonus"])
-        
-        # Check persistent effects from cards
-        # for effect_card in self.persistent_effects:
-        #     if effect_card.attributes_granted.get("MovementBonus"): 
-        #         bonus += int(effect_card.attributes_granted["MovementBonus"])
+            move_bonus += title_card.move_bonus # e.g. {"MovementBonus": 2}
+            fight_bonus += title_card.fight_bonus # e.g. {"FightBonus": 1}
+            wall_pass = wall_pass or title_card.wall_pass
+
+        # Check persistent effects from cards (e.g. "Дикий кот", "Бешеность")
+        # Their MovementBonus is not counted (yet)
+        for effect_card in self.persistent_effects:
+            fight_bonus += effect_card.fight_bonus
+            wall_pass = wall_pass or effect_card.wall_pass
 
         # Check persistent agenda bonuses
         # Agendas might grant bonuses differently, e.g. through their own effect descriptions
-        # For now, assume if an agenda grants a movement bonus, it would be reflected here
+        # For now, assume if an agenda grants a bonus, it would be reflected here
         # or the game logic would handle it via the specific agenda's effect type.
-        # Example: if an agenda effect added a temporary {"MovementBonus": X} to player.temp_stats
-        # Add check for temporary bonuses
+        # for agenda in self.revealed_persistent_agendas:
+            # if agenda_grants_wall_pass_logic / agenda_grants_fight_bonus_logic ...
+
+        # Check temporary bonuses (they do not add to fight rolls)
         for temp_bonus_info in self.temporary_bonuses_this_turn:
             if temp_bonus_info.get("MovementBonus"):
-                bonus += int(temp_bonus_info["MovementBonus"])
-        return bonus
+                move_bonus += int(temp_bonus_info["MovementBonus"])
+            if temp_bonus_info.get("WallPass") == True:
+                wall_pass = True
+
+        self._cached_move_bonus = move_bonus
+        self._cached_fight_bonus = fight_bonus
+        self._cached_wall_pass = wall_pass
+        self._bonuses_dirty = False
+
+    def get_movement_bonus(self) -> int:
+        if self._bonuses_dirty: self._recompute_bonuses()
+        return self._cached_move_bonus
 
     def can_pass_through_walls(self) -> bool:
-        # Check active titles
-        for title_card in self.active_titles:
-            if title_card.attributes_granted.get("WallPass") == True:
-                return True
-        
-        # Check persistent effects from cards (e.g. "Дикий кот")
-        for effect_card in self.persistent_effects:
-            if effect_card.attributes_granted.get("WallPass") == True:
-                return True
-        
-        # Check persistent agenda bonuses
-        # for agenda in self.revealed_persistent_agendas:
-            # if agenda_grants_wall_pass_logic ...
-        # Add check for temporary bonuses
-        for temp_bonus_info in self.temporary_bonuses_this_turn:
-            if temp_bonus_info.get("WallPass") == True:
-                return True
-        return False
+        if self._bonuses_dirty: self._recompute_bonuses()
+        return self._cached_wall_pass
 
     def get_fight_bonus(self) -> int:
-        bonus = 0
-        # Check active titles
-        for title_card in self.active_titles:
-            if title_card.attributes_granted.get("FightBonus"): # e.g. {"FightBonus": 1}
-                bonus += int(title_card.attributes_granted["FightBonus"])
-        
-        # Check persistent effects from cards (e.g. "Бешеность")
-        for effect_card in self.persistent_effects:
-            if effect_card.attributes_granted.get("FightBonus"): 
-                bonus += int(effect_card.attributes_granted["FightBonus"])
-
-        # Check persistent agenda bonuses
-        # for agenda in self.revealed_persistent_agendas:
-            # if agenda_grants_fight_bonus_logic ...
-        return bonus
+        if self._bonuses_dirty: self._recompute_bonuses()
+        return self._cached_fight_bonus
 
     def has_active_effect_preventing_trust_gain(self) -> bool:
-        for effect_card in self.persistent_effects:
-            # Based on cards like "Дикий кот", "Бешеность"
-            if effect_card.title in ["Дикий кот", "Бешеность"]:
-                 # More robust: check effect_card.attributes_granted.get("PreventsTrustGain") == True
-                return True
-        return False
+        # Based on cards like "Дикий кот", "Бешеность"
+        # More robust: check effect_card.attributes_granted.get("PreventsTrustGain") == True
+        return not self.persistent_effect_titles.isdisjoint(Player.TRUST_GAIN_BLOCKERS)
 
     def set_secret_agenda(self, agenda_card: 'AgendaCard'):
         if self.secret_agenda is None:
             self.secret_agenda = agenda_card
-            print(f"> {self.id} received secret agenda: {agenda_card.title}")
+            # Keyed by exact class, so lookups are a single dict hit. A subclass of a condition class
+            # gets its own bucket and is not found under its parent's key.
+            self.agenda_conditions_by_type = {}
+            for condition in agenda_card.objective_conditions:
+                self.agenda_conditions_by_type.setdefault(type(condition), []).append(condition)
+            logger.info("> %s received secret agenda: %s", self.id, agenda_card.title)
         else:
-            print(f"Warning: {self.id} already has a secret agenda. Cannot set new one: {agenda_card.title}")
+            logger.warning("%s already has a secret agenda. Cannot set new one: %s", self.id, agenda_card.title)
 
     def reveal_agenda(self) -> Optional['AgendaCard']:
         """Called when a player believes they have completed their secret agenda."""
         # In a full implementation, this would trigger objective checking.
         # For now, it just reveals the card for manual processing.
         if self.secret_agenda:
-            print(f"> {self.id} reveals agenda: {self.secret_agenda.title}")
+            logger.info("> %s reveals agenda: %s", self.id, self.secret_agenda.title)
             # print(f"  Objective: {self.secret_agenda.objective_text}")
             # print(f"  Reward: {self.secret_agenda.reward_text}")
             revealed = self.secret_agenda
@@ -271,96 +436,127 @@ class Player:
                                       # Game logic will decide if it's discarded or moved to persistent.
             return revealed
         else:
-            print(f"> {self.id} has no secret agenda to reveal.")
+            logger.info("> %s has no secret agenda to reveal.", self.id)
             return None
     
-    def add_persistent_agenda_bonus(self, agenda_card: 'AgendaCard'):
-        """Adds an agenda card that provides an ongoing bonus."""
+    def add_persistent_agenda_bonus(self, agenda_card: 'AgendaCard', bonuses_by_owner: Optional[Dict[str, List[PersistentBonus]]] = None):
+        """Adds an agenda card that provides an ongoing bonus, with its cell bonuses already read from the reward effects."""
         if agenda_card not in self.revealed_persistent_agendas:
             self.revealed_persistent_agendas.append(agenda_card)
-            print(f"> {self.id} now has persistent agenda bonus from: {agenda_card.title}")
+            for owner_name, bonuses in (bonuses_by_owner or {}).items():
+                self.persistent_bonuses_by_owner.setdefault(owner_name, []).extend(bonuses)
+            logger.info("> %s now has persistent agenda bonus from: %s", self.id, agenda_card.title)
 
     def remove_persistent_agenda_bonus(self, agenda_card_title: str) -> bool:
         initial_len = len(self.revealed_persistent_agendas)
-        self.revealed_persistent_agendas = [
+        self.revealed_persistent_agendas[:] = [
             card for card in self.revealed_persistent_agendas if card.title != agenda_card_title
         ]
+        for bonuses in self.persistent_bonuses_by_owner.values():
+            bonuses[:] = [b for b in bonuses if b.agenda_title != agenda_card_title]
         if len(self.revealed_persistent_agendas) < initial_len:
             return True
         return False
 
     # --- Methods for tracking stats for Agendas ---
-    def record_owner_visit(self, owner_cell: 'OwnerCell'):
-        if owner_cell.owner_name in self.visit_counts_this_game:
-            self.visit_counts_this_game[owner_cell.owner_name] += 1
-        else:
-            self.visit_counts_this_game[owner_cell.owner_name] = 1
-        print(f"> {self.id} visit count for {owner_cell.owner_name}: {self.visit_counts_this_game[owner_cell.owner_name]}")
+    def visit_owner_cell(self, owner_cell: 'OwnerCell') -> int:
+        """Registers a visit to an owner's cell: counts it for the game and marks the cell as visited this turn.
+           Returns the new visit count.
+        """
+        owner_name = owner_cell.owner_name
+        count = self.visit_counts_this_game.get(owner_name, 0) + 1
+        self.visit_counts_this_game[owner_name] = count
+        self.visited_special_cells_this_turn.add(owner_cell.row * self.num_cols + owner_cell.col)
+        logger.info("> %s visit count for %s: %s", self.id, owner_name, count)
+        return count
 
     def record_card_usage(self, card_title: str, context: Optional[Dict[str, Any]] = None):
         self.used_card_types_log.append(card_title)
+        self.used_card_counts[card_title] += 1
         # For more complex context for UsedSpecificCardWithContextCondition, log to action_log_this_turn
         if context: 
             action_log_entry = {"type": "UsedCardWithContext", "card_title": card_title, **context}
             self.record_action_in_turn(action_log_entry)
 
+    def count_card_usage(self, card_title: str) -> int:
+        """How many times this game the player has used a card with this title."""
+        return self.used_card_counts[card_title]
+
     def record_action_in_turn(self, action_details: Dict[str, Any]):
         """Records a significant action taken this turn, for complex agenda checks."""
         self.action_log_this_turn.append(action_details)
-        print(f"> {self.id} logged action: {action_details}")
+        logger.info("> %s logged action: %s", self.id, action_details)
 
     def grant_one_time_reroll(self):
         self.has_one_time_reroll_ability = True
-        print(f"> {self.id} gained a one-time re-roll ability!")
+        logger.info("> %s gained a one-time re-roll ability!", self.id)
 
     def consume_one_time_reroll(self) -> bool:
         if self.has_one_time_reroll_ability:
             self.has_one_time_reroll_ability = False
-            print(f"> {self.id} used their one-time re-roll ability.")
+            logger.info("> %s used their one-time re-roll ability.", self.id)
             return True
         return False
 
+    @property
+    def armed_delayed_effects(self) -> Tuple[Tuple['Card', Mapping[str, Any]], ...]:
+        """Read-only (card, play context) pairs for every armed card, grouped by trigger type.
+           Arm and disarm cards through add_armed_delayed_effect/remove_armed_delayed_effect.
+        """
+        return tuple((entry.card, entry.play_context) for bucket in self.armed_delayed_effects_by_type.values() for entry in bucket)
+
     def add_armed_delayed_effect(self, card: 'Card', context: Optional[Dict[str, Any]] = None):
-        """Adds a card whose effect is armed, along with its play context."""
+        """Adds a card whose effect is armed, along with its play context.
+           The card is filed under the type of its first effect's trigger_condition,
+           so the game only looks at cards that can react to a given event.
+           Trigger data and triggered effects are prepared once here (see ArmedEntry).
+        """
         if context is None:
             context = {}
         # Avoid adding the exact same card instance multiple times if logic error somewhere else
         # Simple check by card id for now.
-        if not any(armed_card.id == card.id for armed_card, _ in self.armed_delayed_effects):
-            self.armed_delayed_effects.append((card, context))
-            print(f"> {self.id} armed card: {card.title} w/ context {context}")
+        if card.id not in self.armed_card_event_types:
+            entry = ArmedEntry(card, context)
+            self.armed_card_event_types[card.id] = entry.event_type
+            self.armed_delayed_effects_by_type.setdefault(entry.event_type, []).append(entry)
+            logger.info("> %s armed card: %s w/ context %s", self.id, card.title, context)
         else:
-            print(f"Warning: Card {card.title} (id: {card.id}) already armed.")
+            logger.warning("Card %s (id: %s) already armed.", card.title, card.id)
 
     def remove_armed_delayed_effect(self, card_to_remove: 'Card'):
-        original_len = len(self.armed_delayed_effects)
-        self.armed_delayed_effects = [(card, ctx) for card, ctx in self.armed_delayed_effects if card.id != card_to_remove.id]
-        if len(self.armed_delayed_effects) < original_len:
-            print(f"> {self.id} removed armed card: {card_to_remove.title}")
-        else:
-            print(f"Warning: armed card {card_to_remove.title} not found to remove.")
+        # Only the bucket the card was filed under needs searching
+        event_type = self.armed_card_event_types.pop(card_to_remove.id, None)
+        bucket = self.armed_delayed_effects_by_type.get(event_type, ())
+        for i, entry in enumerate(bucket):
+            if entry.card.id == card_to_remove.id:
+                del bucket[i]
+                logger.info("> %s removed armed card: %s", self.id, card_to_remove.title)
+                return
+        logger.warning("armed card %s not found to remove.", card_to_remove.title)
 
     def add_temporary_bonus(self, bonus_details: Dict[str, Any]):
         """Adds a temporary bonus for the current turn (e.g., from Быстрые лапки)."""
         self.temporary_bonuses_this_turn.append(bonus_details)
-        print(f"> {self.id} gained temporary bonus: {bonus_details}")
+        self._bonuses_dirty = True
+        logger.info("> %s gained temporary bonus: %s", self.id, bonus_details)
 
     # More methods will be added as needed, e.g., for playing cards, fighting, etc.
 
 # Example Usage (for testing, can be removed later)
 if __name__ == '__main__':
-    player1 = Player("Catrick Swayze", 0, 0)
-    print(player1)
+    logging.basicConfig(level=logging.INFO, format="%(message)s") # Show the player's messages
+    player1 = Player("Catrick Swayze", 0, 0, num_cols=10)
+    print(player1.describe())
     player1.gain_food(3)
     player1.lose_food(10) # Test losing more than available
     player1.lose_food(2)
-    print(player1)
+    print(player1.describe())
 
     player1.gain_trust(OWNER_STUDENT, 2)
     player1.gain_trust(OWNER_COOK, 1)
     player1.lose_trust(OWNER_STUDENT, 1)
     player1.lose_trust("NonExistentOwner", 1)
-    print(player1)
+    print(player1.describe())
 
     player1.start_new_turn()
     print(f"Visited (1,1)? {player1.has_visited_cell_this_turn(1,1)}")
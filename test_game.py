@@ -0,0 +1,83 @@
+import importlib.util
+import json
+import os
+import sys
+import unittest
+from types import ModuleType, SimpleNamespace
+
+AGENDAS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "secret_agendas.json")
+
+
+class _StubEffect:
+    def __init__(self, params):
+        self.params = params
+
+
+# Names game.py and card.py import from the effects/agenda/objective_conditions modules
+_STUB_MODULE_CLASSES = {
+    "effects": ("Effect", "ConditionalEffect", "ApplyTitleEffect", "ApplyPersistentEffectCard",
+                "AddPersistentCellVisitBonusEffect", "AddPersistentFoodSourceBonusEffect",
+                "ArmDelayedEffect", "GrantTemporaryBonusEffect", "GainTrustEffect"),
+    "agenda": ("AgendaCard", "AgendaDeck"),
+    "objective_conditions": ("ObjectiveCondition", "EndedTurnWithPlayerStatCondition", "PlayerIsOnAnyOwnerCellCondition",
+                             "IsOnSameCellAsTargetCondition", "UsedSpecificCardWithContextCondition",
+                             "PerformedVoluntaryActionOnLocationCondition", "SuccessfullyPlayedCardWithEffectTypeCondition"),
+}
+
+
+def _install_stub_modules():
+    """Registers minimal stand-ins for the effects/agenda/objective_conditions modules that are not importable,
+       so game.py can be imported and its pure helpers tested without them.
+    """
+    for module_name, class_names in _STUB_MODULE_CLASSES.items():
+        if module_name in sys.modules or importlib.util.find_spec(module_name) is not None:
+            continue
+        module = ModuleType(module_name)
+        for class_name in class_names:
+            setattr(module, class_name, type(class_name, (_StubEffect,), {}))
+        if module_name == "effects":
+            module.EFFECT_REGISTRY = {
+                "AddPersistentCellVisitBonus": module.AddPersistentCellVisitBonusEffect,
+                "AddPersistentFoodSourceBonus": module.AddPersistentFoodSourceBonusEffect,
+            }
+        elif module_name == "objective_conditions":
+            module.OBJECTIVE_REGISTRY = {}
+        sys.modules[module_name] = module
+
+
+_install_stub_modules()
+from effects import EFFECT_REGISTRY
+from game import Game
+
+
+class PersistentAgendaBonusTest(unittest.TestCase):
+    """Persistent agenda rewards as written in secret_agendas.json must turn into landing bonuses."""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(AGENDAS_PATH, encoding="utf-8") as f:
+            cls.agendas = json.load(f)
+
+    def _bonuses_of_agenda_with(self, reward_type):
+        agenda_data = next(a for a in self.agendas if any(e["type"] == reward_type for e in a["reward_effects"]))
+        reward_effects = [EFFECT_REGISTRY[e["type"]](e["params"]) for e in agenda_data["reward_effects"] if e["type"] in EFFECT_REGISTRY]
+        agenda = SimpleNamespace(title=agenda_data["title"], reward_effects=reward_effects)
+        return Game._persistent_bonuses_of(Game.__new__(Game), agenda)
+
+    def test_cell_visit_bonus(self):
+        bonuses = self._bonuses_of_agenda_with("AddPersistentCellVisitBonus")
+        self.assertEqual(list(bonuses), ["Student"])
+        (bonus,) = bonuses["Student"]
+        self.assertEqual(bonus.food_amount, 1)
+        self.assertFalse(bonus.needs_food_from_cell)
+
+    def test_food_source_bonus(self):
+        bonuses = self._bonuses_of_agenda_with("AddPersistentFoodSourceBonus")
+        self.assertEqual(list(bonuses), ["Cook"])
+        (bonus,) = bonuses["Cook"]
+        self.assertEqual(bonus.food_amount, 1)
+        self.assertTrue(bonus.needs_food_from_cell)
+
+
+if __name__ == "__main__":
+    unittest.main()
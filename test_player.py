@@ -0,0 +1,57 @@
+import unittest
+
+from player import Player
+
+_CLONE_CONTAINERS = Player._CLONE_LISTS + Player._CLONE_SETS_AND_DICTS + Player._CLONE_DICTS_OF_LISTS
+
+
+def _populated_player() -> Player:
+    """A player with at least one item in every container slot that clone_into copies."""
+    player = Player("Source", 2, 3, num_cols=10)
+    player.gain_food(4)
+    player.gain_trust("Cook", 2)
+    for name in Player._CLONE_LISTS:
+        getattr(player, name).append(name)
+    for name in Player._CLONE_SETS_AND_DICTS:
+        container = getattr(player, name)
+        if isinstance(container, set):
+            container.add(name)
+        else:
+            container[name] = 1
+    for name in Player._CLONE_DICTS_OF_LISTS:
+        getattr(player, name)[name] = [name]
+    return player
+
+
+class CloneIntoTest(unittest.TestCase):
+    def test_clone_groups_cover_all_slots(self):
+        groups = (Player._CLONE_ASSIGNED, Player._CLONE_LISTS, Player._CLONE_SETS_AND_DICTS, Player._CLONE_DICTS_OF_LISTS)
+        names = [name for group in groups for name in group]
+        self.assertEqual(len(names), len(set(names)), "a slot is listed in more than one _CLONE_* group")
+        self.assertEqual(set(names), set(Player.__slots__))
+
+    def test_round_trip_copies_state_without_aliasing(self):
+        source = _populated_player()
+        target = Player("Target", 0, 0, num_cols=10)
+        target_containers = {name: getattr(target, name) for name in _CLONE_CONTAINERS}
+
+        source.clone_into(target)
+
+        for name in Player.__slots__:
+            self.assertEqual(getattr(target, name), getattr(source, name), name)
+        for name in _CLONE_CONTAINERS:
+            self.assertIs(getattr(target, name), target_containers[name], f"{name} was replaced, not reused")
+            self.assertIsNot(getattr(target, name), getattr(source, name), f"{name} is shared with the source")
+        for name in Player._CLONE_DICTS_OF_LISTS:
+            for key, items in getattr(source, name).items():
+                self.assertIsNot(getattr(target, name)[key], items, f"{name}[{key!r}] is shared with the source")
+
+        # Changes to the copy must not reach the source
+        target.gain_trust("Cook", 1)
+        target.persistent_bonuses_by_owner["persistent_bonuses_by_owner"].append("extra")
+        self.assertEqual(source.trust_with("Cook"), 2)
+        self.assertEqual(source.persistent_bonuses_by_owner["persistent_bonuses_by_owner"], ["persistent_bonuses_by_owner"])
+
+
+if __name__ == "__main__":
+    unittest.main()